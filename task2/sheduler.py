@@ -5,87 +5,186 @@ This script manages computational job requests and processes them using
 Round Robin or Priority Scheduling algorithms.
 """
 
+import atexit
+import mmap
 import os
 import sys
-from datetime import datetime
-from typing import List, Dict
+import time
+from collections import deque
+from operator import attrgetter
+from typing import List, NamedTuple, Tuple
 
 # File paths for persistent storage
 JOB_QUEUE_FILE = "job_queue.txt"
 COMPLETED_JOBS_FILE = "completed_jobs.txt"
 SCHEDULER_LOG_FILE = "scheduler_log.txt"
 
+class Job(NamedTuple):
+    """A pending job request as stored in the job queue file."""
+    student_id: str
+    job_name: str
+    exec_time: int
+    priority: int
+
+
+# Template for the per-slice Round Robin log line, filled in by log_events()
+RR_EXECUTION_LOG = "RR_EXECUTION | Student=%s | Job=%s | RunTime=%ds | Remaining=%ds"
+
+# Priority column text mapped to its value, so load_jobs can skip int()
+# for the valid 1-10 range
+_PRIORITY_VALUES = {str(p): p for p in range(1, 11)}
+
+# Last parsed queue, keyed by the queue file's (mtime_ns, size)
+_jobs_cache = {"stamp": None, "jobs": []}
+
+# Completed job records waiting to be written by _flush_completed()
+_pending_completed: List[str] = []
+
+# Scheduler log handle, opened on first use and kept for the whole session
+_log_fh = None
+
+def _get_log_handle():
+    """Return the shared scheduler log handle, opening it if needed."""
+    global _log_fh
+    if _log_fh is None:
+        _log_fh = open(SCHEDULER_LOG_FILE, "a", buffering=1 << 16, encoding="utf-8")
+    return _log_fh
+
+
+def _close_log() -> None:
+    """Close the scheduler log handle, if open, when the interpreter exits."""
+    if _log_fh is not None:
+        _log_fh.close()
+
+
+atexit.register(_close_log)
+
+
+def flush_log() -> None:
+    """Push any buffered scheduler log lines to disk."""
+    if _log_fh is not None:
+        _log_fh.flush()
+
+
+# Last formatted timestamp as [epoch second, "%Y-%m-%d %H:%M:%S" string]
+_ts_cache = [-1, ""]
+
+def _timestamp() -> str:
+    """Return the current local time, reformatting at most once per second."""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(now))
+    return _ts_cache[1]
+
+
 def log_event(message: str) -> None:
     """Log scheduling events with timestamp to the scheduler log file."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(SCHEDULER_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{timestamp} | {message}\n")
+    timestamp = _timestamp()
+    _get_log_handle().write(f"{timestamp} | {message}\n")
 
 
-def load_jobs() -> List[Dict]:
+def log_events(template: str, rows: List[tuple]) -> None:
+    """Log a batch of %-style events under one timestamp in a single write."""
+    if not rows:
+        return
+    timestamp = _timestamp()
+    _get_log_handle().writelines(f"{timestamp} | {template % row}\n" for row in rows)
+
+
+def _invalidate_jobs_cache() -> None:
+    """Force the next load_jobs() call to re-read the queue file."""
+    _jobs_cache["stamp"] = None
+
+
+def load_jobs() -> List[Job]:
     """Load pending jobs from the job queue file."""
     jobs = []
     
-    if not os.path.exists(JOB_QUEUE_FILE):
+    # One stat() both checks for the file and tells us if it changed
+    try:
+        st = os.stat(JOB_QUEUE_FILE)
+    except OSError:
         return jobs
     
+    stamp = (st.st_mtime_ns, st.st_size)
+    if stamp == _jobs_cache["stamp"]:
+        return list(_jobs_cache["jobs"])
+    
     try:
+        # Read the whole queue in one call and split it in C rather than
+        # pulling it through the buffered reader one line at a time
         with open(JOB_QUEUE_FILE, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, start=1):
-                line = line.strip()
-                if not line:
-                    continue
-                
-                parts = line.split("|")
-                if len(parts) != 4:
-                    print(f"Warning: Skipping malformed entry on line {line_num}")
-                    continue
-                
-                student_id, job_name, exec_time_str, priority_str = parts
-                
-                try:
-                    exec_time = int(exec_time_str)
+            lines = f.read().split("\n")
+        
+        append = jobs.append
+        priority_values = _PRIORITY_VALUES
+        for line_num, line in enumerate(lines, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            
+            parts = line.split("|")
+            if len(parts) != 4:
+                print(f"Warning: Skipping malformed entry on line {line_num}")
+                continue
+            
+            student_id, job_name, exec_time_str, priority_str = parts
+            
+            try:
+                priority = priority_values.get(priority_str)
+                if priority is None:
                     priority = int(priority_str)
-                    
-                    jobs.append({
-                        "student_id": student_id,
-                        "job_name": job_name,
-                        "exec_time": exec_time,
-                        "priority": priority
-                    })
-                except ValueError:
-                    print(f"Warning: Invalid numeric values on line {line_num}")
-                    continue
+                append(Job(student_id, job_name, int(exec_time_str), priority))
+            except ValueError:
+                print(f"Warning: Invalid numeric values on line {line_num}")
+                continue
+        
+        _jobs_cache["stamp"] = stamp
+        _jobs_cache["jobs"] = list(jobs)
     
     except Exception as e:
         print(f"Error loading jobs: {e}")
     
     return jobs
 
-def save_jobs(jobs: List[Dict]) -> None:
+def save_jobs(jobs: List[Job]) -> None:
     """Save pending jobs to the job queue file."""
     try:
+        data = "".join(
+            f"{job.student_id}|{job.job_name}|{job.exec_time}|{job.priority}\n"
+            for job in jobs
+        )
         with open(JOB_QUEUE_FILE, "w", encoding="utf-8") as f:
-            for job in jobs:
-                f.write(
-                    f"{job['student_id']}|{job['job_name']}|"
-                    f"{job['exec_time']}|{job['priority']}\n"
-                )
+            f.write(data)
     except Exception as e:
         print(f"Error saving jobs: {e}")
+    finally:
+        _invalidate_jobs_cache()
+
 
+def append_completed_job(job: Job, algorithm: str) -> None:
+    """Queue a completed job record; written out by _flush_completed()."""
+    timestamp = _timestamp()
+    _pending_completed.append(
+        f"{timestamp}|{job.student_id}|{job.job_name}|"
+        f"{job.exec_time}|{job.priority}|{algorithm}\n"
+    )
 
-def append_completed_job(job: Dict, algorithm: str) -> None:
-    """Append a completed job to the completed jobs file."""
+
+def _flush_completed() -> None:
+    """Append all queued completed job records to the completed jobs file."""
+    if not _pending_completed:
+        return
+    
     try:
         with open(COMPLETED_JOBS_FILE, "a", encoding="utf-8") as f:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            f.write(
-                f"{timestamp}|{job['student_id']}|{job['job_name']}|"
-                f"{job['exec_time']}|{job['priority']}|{algorithm}\n"
-            )
+            f.writelines(_pending_completed)
     except Exception as e:
         print(f"Error recording completed job: {e}")
+    
+    _pending_completed.clear()
+    flush_log()
 
 
 def view_pending_jobs() -> None:
@@ -104,8 +203,8 @@ def view_pending_jobs() -> None:
     
     for idx, job in enumerate(jobs, start=1):
         print(
-            f"{idx:<4} {job['student_id']:<12} {job['job_name']:<20} "
-            f"{job['exec_time']:<8} {job['priority']:<8}"
+            f"{idx:<4} {job.student_id:<12} {job.job_name:<20} "
+            f"{job.exec_time:<8} {job.priority:<8}"
         )
     
     print("=" * 70 + "\n")
@@ -156,6 +255,7 @@ def submit_job() -> None:
     try:
         with open(JOB_QUEUE_FILE, "a", encoding="utf-8") as f:
             f.write(f"{student_id}|{job_name}|{exec_time}|{priority}\n")
+        _invalidate_jobs_cache()
         
         print("\n✓ Job submitted successfully!")
         print(f"  Student ID: {student_id}")
@@ -172,10 +272,45 @@ def submit_job() -> None:
         print(f"Error: Failed to submit job: {e}")
 
 
-def round_robin_scheduling() -> None:
-    """Process jobs using Round Robin scheduling with 5-second time quantum."""
-    jobs = load_jobs()
+def _rr_simulate(exec_times: List[int], quantum: int) -> List[List[Tuple[int, int, int]]]:
+    """Simulate Round Robin, returning (job index, run time, remaining) per cycle."""
+    # Ready queue of job indices: a job is popped, given one quantum and
+    # pushed back only if it still needs time, so finished jobs are never
+    # revisited. None marks the end of a cycle.
+    ready = deque(idx for idx, exec_time in enumerate(exec_times) if exec_time > 0)
+    remaining = list(exec_times)
+    schedule = []
+    
+    if not ready:
+        return schedule
+    
+    ready.append(None)
+    slices = []
     
+    while True:
+        idx = ready.popleft()
+        
+        if idx is None:
+            schedule.append(slices)
+            if not ready:
+                break
+            ready.append(None)
+            slices = []
+            continue
+        
+        # Determine how much time this job gets in this cycle
+        run_time = min(quantum, remaining[idx])
+        left = remaining[idx] - run_time
+        remaining[idx] = left
+        slices.append((idx, run_time, left))
+        if left > 0:
+            ready.append(idx)
+    
+    return schedule
+
+
+def round_robin_scheduling(jobs: List[Job]) -> None:
+    """Process jobs using Round Robin scheduling with 5-second time quantum."""
     if not jobs:
         print("\nNo jobs to schedule.\n")
         return
@@ -185,51 +320,39 @@ def round_robin_scheduling() -> None:
     print(f"       ROUND ROBIN SCHEDULING (Time Quantum = {TIME_QUANTUM} seconds)")
     print("=" * 70 + "\n")
     
-    # Initialize remaining time for each job
-    for job in jobs:
-        job["remaining"] = job["exec_time"]
+    schedule = _rr_simulate([job.exec_time for job in jobs], TIME_QUANTUM)
     
-    execution_log = []
-    cycle = 1
+    # RR_EXECUTION fields are queued here and formatted and logged as one
+    # batch at the end
+    events = []
     
-    # Process jobs in round-robin fashion
-    while any(job["remaining"] > 0 for job in jobs):
-        print(f"--- Cycle {cycle} ---")
+    # Process jobs in round-robin fashion, writing each cycle's output at once
+    for cycle, slices in enumerate(schedule, start=1):
+        out = [f"--- Cycle {cycle} ---\n"]
         
-        for job in jobs:
-            if job["remaining"] <= 0:
-                continue
-            
-            # Determine how much time this job gets in this cycle
-            run_time = min(TIME_QUANTUM, job["remaining"])
-            job["remaining"] -= run_time
+        for idx, run_time, left in slices:
+            job = jobs[idx]
             
-            print(
-                f"  Running: {job['job_name']} (Student: {job['student_id']}) "
-                f"for {run_time}s | Remaining: {job['remaining']}s"
+            out.append(
+                f"  Running: {job.job_name} (Student: {job.student_id}) "
+                f"for {run_time}s | Remaining: {left}s\n"
             )
             
-            execution_log.append({
-                "student_id": job["student_id"],
-                "job_name": job["job_name"],
-                "run_time": run_time,
-                "remaining": job["remaining"]
-            })
-            
-            log_event(
-                f"RR_EXECUTION | Student={job['student_id']} | Job={job['job_name']} | "
-                f"RunTime={run_time}s | Remaining={job['remaining']}s"
-            )
+            events.append((job.student_id, job.job_name, run_time, left))
             
             # If job completed, record it
-            if job["remaining"] == 0:
+            if left == 0:
                 append_completed_job(job, "RoundRobin")
-                print(f"    ✓ Job '{job['job_name']}' COMPLETED")
+                out.append(f"    ✓ Job '{job.job_name}' COMPLETED\n")
         
-        cycle += 1
-        print()
+        out.append("\n")
+        sys.stdout.write("".join(out))
+    
+    sys.stdout.flush()
+    log_events(RR_EXECUTION_LOG, events)
     
-    # Clear the job queue
+    # Record completed jobs and clear the job queue
+    _flush_completed()
     save_jobs([])
     
     print("=" * 70)
@@ -238,10 +361,23 @@ def round_robin_scheduling() -> None:
     
     log_event(f"Round Robin scheduling completed: {len(jobs)} job(s) processed")
 
-def priority_scheduling() -> None:
-    """Process jobs using Priority scheduling (highest priority first)."""
-    jobs = load_jobs()
+def _sort_by_priority(jobs: List[Job]) -> List[Job]:
+    """Return jobs highest priority first, keeping queue order on ties."""
+    # Priorities are bounded to 1-10, so a counting sort over ten buckets
+    # orders the queue in one pass without any comparisons
+    buckets = [[] for _ in range(11)]
+    for job in jobs:
+        priority = job.priority
+        if not 1 <= priority <= 10:
+            # Out-of-range value from a hand-edited queue file
+            return sorted(jobs, key=attrgetter("priority"), reverse=True)
+        buckets[priority].append(job)
     
+    return [job for bucket in reversed(buckets) for job in bucket]
+
+
+def priority_scheduling(jobs: List[Job]) -> None:
+    """Process jobs using Priority scheduling (highest priority first)."""
     if not jobs:
         print("\nNo jobs to schedule.\n")
         return
@@ -251,26 +387,27 @@ def priority_scheduling() -> None:
     print("=" * 70 + "\n")
     
     # Sort jobs by priority in descending order (10 is highest priority)
-    sorted_jobs = sorted(jobs, key=lambda j: j["priority"], reverse=True)
+    sorted_jobs = _sort_by_priority(jobs)
     
     print(f"{'#':<4} {'Student ID':<12} {'Job Name':<20} {'Time(s)':<8} {'Priority':<8}")
     print("-" * 70)
     
     for idx, job in enumerate(sorted_jobs, start=1):
         print(
-            f"{idx:<4} {job['student_id']:<12} {job['job_name']:<20} "
-            f"{job['exec_time']:<8} {job['priority']:<8}"
+            f"{idx:<4} {job.student_id:<12} {job.job_name:<20} "
+            f"{job.exec_time:<8} {job.priority:<8}"
         )
         
         log_event(
-            f"PRIORITY_EXECUTION | Student={job['student_id']} | Job={job['job_name']} | "
-            f"ExecTime={job['exec_time']}s | Priority={job['priority']}"
+            f"PRIORITY_EXECUTION | Student={job.student_id} | Job={job.job_name} | "
+            f"ExecTime={job.exec_time}s | Priority={job.priority}"
         )
         
         # Record completed job
         append_completed_job(job, "Priority")
     
-    # Clear the job queue
+    # Record completed jobs and clear the job queue
+    _flush_completed()
     save_jobs([])
     
     print("\n" + "=" * 70)
@@ -286,33 +423,48 @@ def view_completed_jobs() -> None:
         return
     
     try:
-        with open(COMPLETED_JOBS_FILE, "r", encoding="utf-8") as f:
-            lines = [line.strip() for line in f if line.strip()]
+        with open(COMPLETED_JOBS_FILE, "rb") as f:
+            # An empty file cannot be memory-mapped
+            if os.fstat(f.fileno()).st_size == 0:
+                print("\nNo completed jobs recorded yet.\n")
+                return
+            
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            
+            # Walk the mapped file in place and only decode rows that are shown
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                count = 0
+                for line in iter(mm.readline, b""):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    
+                    if count == 0:
+                        print("\n" + "=" * 90)
+                        print("                              COMPLETED JOBS")
+                        print("=" * 90)
+                        print(
+                            f"{'Timestamp':<20} {'Student ID':<12} {'Job Name':<20} "
+                            f"{'Time(s)':<8} {'Priority':<8} {'Algorithm':<12}"
+                        )
+                        print("-" * 90)
+                    count += 1
+                    
+                    parts = line.decode("utf-8").split("|")
+                    if len(parts) == 6:
+                        timestamp, student_id, job_name, exec_time, priority, algorithm = parts
+                        print(
+                            f"{timestamp:<20} {student_id:<12} {job_name:<20} "
+                            f"{exec_time:<8} {priority:<8} {algorithm:<12}"
+                        )
         
-        if not lines:
+        if not count:
             print("\nNo completed jobs recorded yet.\n")
             return
         
-        print("\n" + "=" * 90)
-        print("                              COMPLETED JOBS")
-        print("=" * 90)
-        print(
-            f"{'Timestamp':<20} {'Student ID':<12} {'Job Name':<20} "
-            f"{'Time(s)':<8} {'Priority':<8} {'Algorithm':<12}"
-        )
-        print("-" * 90)
-        
-        for line in lines:
-            parts = line.split("|")
-            if len(parts) == 6:
-                timestamp, student_id, job_name, exec_time, priority, algorithm = parts
-                print(
-                    f"{timestamp:<20} {student_id:<12} {job_name:<20} "
-                    f"{exec_time:<8} {priority:<8} {algorithm:<12}"
-                )
-        
         print("=" * 90 + "\n")
-        log_event(f"Viewed {len(lines)} completed job(s)")
+        log_event(f"Viewed {count} completed job(s)")
     
     except Exception as e:
         print(f"Error reading completed jobs: {e}")
@@ -335,9 +487,9 @@ def process_job_queue() -> None:
     choice = input("Enter your choice [1-2]: ").strip()
     
     if choice == "1":
-        round_robin_scheduling()
+        round_robin_scheduling(jobs)
     elif choice == "2":
-        priority_scheduling()
+        priority_scheduling(jobs)
     else:
         print("\nInvalid choice. Returning to main menu.\n")
 
@@ -350,6 +502,7 @@ def bye_exit() -> None:
     if confirm in ["Y", "YES"]:
         print("\nBye")
         log_event("Job scheduler exited by user")
+        flush_log()
         sys.exit(0)
     elif confirm in ["N", "NO"]:
         print("Exit cancelled. Returning to main menu.\n")
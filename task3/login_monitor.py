@@ -8,8 +8,17 @@ Called by secure_core.sh with the submission log file path as argument.
 import sys
 import os
 import json
+import math
+import time
+import atexit
 import hashlib
-from datetime import datetime
+import hmac
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib json module
+    orjson = None
 
 # File paths
 ACCOUNTS_FILE = "accounts.json"
@@ -17,64 +26,276 @@ LOGIN_LOG_FILE = "login_attempts.txt"
 MAX_FAILED_ATTEMPTS = 3
 LOCKOUT_DURATION_MINUTES = 30
 
+# Timestamp format used in the login log and account records
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+
+# Login log statuses
+STATUS_SUCCESS = "SUCCESS"
+STATUS_FAILED = "FAILED"
+STATUS_LOCKED = "LOCKED"
+STATUS_BLOCKED = "BLOCKED"
+STATUS_UNLOCKED = "UNLOCKED"
+STATUS_ACCOUNT_CREATED = "ACCOUNT_CREATED"
+
+# Account roles
+ROLE_STUDENT = "student"
+ROLE_ADMIN = "admin"
+
+# scrypt cost parameters for password hashing (~16 MB of memory per hash)
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_PREFIX = f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}$"
+
+
+# Buffered login log lines are flushed after this many writes or seconds
+LOG_FLUSH_EVERY = 20
+LOG_FLUSH_INTERVAL = 1.0
+
+# The login log is rotated once it reaches this size, keeping the newest
+# LOGIN_LOG_BACKUPS generations as LOGIN_LOG_FILE + ".1" (newest) to ".N"
+LOGIN_LOG_MAX_BYTES = 10 * 1024 * 1024
+LOGIN_LOG_BACKUPS = 5
+
+# Failed logins delay the next attempt by 2 ** failed_attempts seconds. With
+# MAX_FAILED_ATTEMPTS = 3 that is 2 s then 4 s before the lockout takes over;
+# the cap only takes effect if MAX_FAILED_ATTEMPTS is raised above 5
+BACKOFF_MAX_SECONDS = 30
+
+# Username -> epoch time before which another password attempt is refused
+_attempt_backoff = {}
+
+# Set when accounts change in memory; cleared by flush_accounts()
+_accounts_dirty = False
+
+# Accounts file (mtime_ns, size) as of this process's last load or save
+_accounts_stamp = None
+
+# Login log handle, opened on first use and kept for the whole session
+_log_fh = None
+_log_pending = 0
+_log_last_flush = 0.0
+
+
+def _rotate_login_log() -> None:
+    """Shift the login log to .1, .1 to .2 and so on, dropping the oldest generation."""
+    for n in range(LOGIN_LOG_BACKUPS - 1, 0, -1):
+        older = f"{LOGIN_LOG_FILE}.{n}"
+        if os.path.exists(older):
+            os.replace(older, f"{LOGIN_LOG_FILE}.{n + 1}")
+    os.replace(LOGIN_LOG_FILE, LOGIN_LOG_FILE + ".1")
+
+
+def _get_log_handle():
+    """Return the shared login log handle, opening it if needed."""
+    global _log_fh, _log_last_flush
+    if _log_fh is None:
+        if os.path.exists(LOGIN_LOG_FILE) and os.path.getsize(LOGIN_LOG_FILE) >= LOGIN_LOG_MAX_BYTES:
+            _rotate_login_log()
+        _log_fh = open(LOGIN_LOG_FILE, "a", buffering=8192, encoding="utf-8")
+        _log_last_flush = time.time()
+    return _log_fh
+
 
-def log_login_event(username: str, status: str, details: str) -> None:
-    """Log login events with timestamp."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    with open(LOGIN_LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(f"{timestamp} | USER={username} | STATUS={status} | {details}\n")
+def _close_login_log() -> None:
+    """Close whichever login log handle is open when the interpreter exits."""
+    if _log_fh is not None:
+        _log_fh.close()
+
+
+# Registered once: rotation reopens the handle, so it cannot register itself
+atexit.register(_close_login_log)
+
+
+def flush_login_log(rotate: bool = True) -> None:
+    """Push any buffered login log lines to disk, rotating the log if it is full."""
+    global _log_fh, _log_pending, _log_last_flush
+    if _log_fh is not None:
+        _log_fh.flush()
+        if rotate and _log_fh.tell() >= LOGIN_LOG_MAX_BYTES:
+            # Reopened (after the rotation) by the next _get_log_handle() call
+            _log_fh.close()
+            _log_fh = None
+            _rotate_login_log()
+    _log_pending = 0
+    _log_last_flush = time.time()
+
+
+# Last formatted timestamp as [epoch second, TS_FMT string]
+_ts_cache = [-1, ""]
+
+
+def _now_str() -> str:
+    """Return the current local time, reformatting at most once per second."""
+    now = int(time.time())
+    if now != _ts_cache[0]:
+        _ts_cache[0] = now
+        _ts_cache[1] = time.strftime(TS_FMT, time.localtime(now))
+    return _ts_cache[1]
+
+
+def log_login_event(username: str, status: str, details: str, force_flush: bool = False) -> None:
+    """Log login events with timestamp; force_flush writes audit-critical events at once."""
+    global _log_pending
+    timestamp = _now_str()
+    _get_log_handle().write(f"{timestamp}\t{username}\t{status}\t{details}\n")
+    _log_pending += 1
+
+    if (force_flush or _log_pending >= LOG_FLUSH_EVERY
+            or time.time() - _log_last_flush >= LOG_FLUSH_INTERVAL):
+        flush_login_log()
+
+
+def read_tail_lines(path: str, count: int, window: int) -> list:
+    """Return the last count lines of a file, reading only a window from its end."""
+    with open(path, "rb") as f:
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            start = max(0, size - window)
+            f.seek(start)
+            lines = f.read().decode("utf-8", "replace").splitlines()
+
+            # The first line is cut off unless the read began at the start of
+            # the file, so widen the window until enough whole lines are in it
+            if start == 0 or len(lines) > count:
+                return lines[-count:]
+            window *= 2
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256."""
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with salted scrypt as 'scrypt$n$r$p$salt$hash'."""
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return f"{SCRYPT_PREFIX}{salt.hex()}${digest.hex()}"
+
+
+def verify_password(password: str, stored_hash: str) -> bool:
+    """Check a password against a stored scrypt or legacy SHA-256 hash."""
+    if stored_hash.startswith("scrypt$"):
+        try:
+            _, n, r, p, salt, expected = stored_hash.split("$")
+            digest = hashlib.scrypt(
+                password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p)
+            )
+        except ValueError:
+            return False
+        return hmac.compare_digest(digest.hex(), expected)
+
+    # Unsalted SHA-256 hash from accounts created before scrypt was used
+    legacy_hash = hashlib.sha256(password.encode()).hexdigest()
+    return hmac.compare_digest(legacy_hash, stored_hash)
+
+
+def needs_rehash(stored_hash: str) -> bool:
+    """Return True if a stored hash predates the current scrypt parameters."""
+    return not stored_hash.startswith(SCRYPT_PREFIX)
+
+
+def _accounts_file_stamp():
+    """Return the accounts file's (mtime_ns, size), or None if it is missing."""
+    try:
+        st = os.stat(ACCOUNTS_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def accounts_changed_on_disk() -> bool:
+    """Return True if the accounts file changed since this process last read or wrote it."""
+    return _accounts_file_stamp() != _accounts_stamp
 
 
 def load_accounts() -> dict:
     """Load accounts from the accounts file."""
-    if not os.path.exists(ACCOUNTS_FILE):
+    global _accounts_stamp
+    _accounts_stamp = _accounts_file_stamp()
+    if _accounts_stamp is None:
         return {}
     try:
-        with open(ACCOUNTS_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(ACCOUNTS_FILE, "rb") as f:
+            data = f.read()
+        accounts = orjson.loads(data) if orjson is not None else json.loads(data)
     except (json.JSONDecodeError, IOError):
         return {}
 
+    for account in accounts.values():
+        _migrate_lockout_time(account)
+    return accounts
+
+
+def _migrate_lockout_time(account: dict) -> None:
+    """Convert a legacy 'lockout_time' string into a 'lockout_expiry' epoch."""
+    if "lockout_time" not in account:
+        # Hand edits may use null for "not locked", as the old schema did
+        if "lockout_expiry" in account and account["lockout_expiry"] is None:
+            account["lockout_expiry"] = 0
+        return
+    lockout_time_str = account.pop("lockout_time")
+    expiry = 0.0
+    if lockout_time_str:
+        try:
+            lockout_time = time.mktime(time.strptime(lockout_time_str, TS_FMT))
+            expiry = lockout_time + LOCKOUT_DURATION_MINUTES * 60
+        except ValueError:
+            pass
+    account["lockout_expiry"] = expiry
+
 
 def save_accounts(accounts: dict) -> None:
-    """Save accounts to the accounts file."""
-    with open(ACCOUNTS_FILE, "w", encoding="utf-8") as f:
-        json.dump(accounts, f, indent=4)
-
-
-def is_account_locked(account: dict) -> bool:
-    """Check if an account is currently locked out."""
-    if account.get("failed_attempts", 0) >= MAX_FAILED_ATTEMPTS:
-        lockout_time_str = account.get("lockout_time")
-        if lockout_time_str:
-            lockout_time = datetime.strptime(lockout_time_str, "%Y-%m-%d %H:%M:%S")
-            elapsed = (datetime.now() - lockout_time).total_seconds() / 60
-            if elapsed < LOCKOUT_DURATION_MINUTES:
-                remaining = int(LOCKOUT_DURATION_MINUTES - elapsed)
-                return True, remaining
-            else:
-                # Lockout expired, reset
-                return False, 0
-    return False, 0
+    """Save accounts via a temp file and atomic rename so a crash cannot corrupt them."""
+    global _accounts_stamp
+    if orjson is not None:
+        data = orjson.dumps(accounts)
+    else:
+        data = json.dumps(accounts, separators=(",", ":")).encode("utf-8")
 
+    # Keep the existing file's permissions (private by default) on the
+    # replacement, and never expose the hashes with looser ones meanwhile
+    try:
+        mode = os.stat(ACCOUNTS_FILE).st_mode & 0o777
+    except OSError:
+        mode = 0o600
 
-def get_lockout_status(account: dict):
-    """Return (is_locked: bool, minutes_remaining: int)."""
-    if account.get("failed_attempts", 0) >= MAX_FAILED_ATTEMPTS:
-        lockout_time_str = account.get("lockout_time")
-        if lockout_time_str:
-            lockout_time = datetime.strptime(lockout_time_str, "%Y-%m-%d %H:%M:%S")
-            elapsed = (datetime.now() - lockout_time).total_seconds() / 60
-            if elapsed < LOCKOUT_DURATION_MINUTES:
-                remaining = int(LOCKOUT_DURATION_MINUTES - elapsed)
-                return True, remaining
-            else:
-                return False, 0
+    tmp_file = ACCOUNTS_FILE + ".tmp"
+    try:
+        os.remove(tmp_file)  # A stale temp file would keep its old mode
+    except FileNotFoundError:
+        pass
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.chmod(tmp_file, mode)  # The umask may have masked bits off at creation
+    os.replace(tmp_file, ACCOUNTS_FILE)
+    _accounts_stamp = _accounts_file_stamp()
+
+
+def mark_accounts_dirty() -> None:
+    """Record that the in-memory accounts differ from the accounts file."""
+    global _accounts_dirty
+    _accounts_dirty = True
+
+
+def flush_accounts(accounts: dict) -> None:
+    """Write accounts to disk once if anything changed since the last flush."""
+    global _accounts_dirty
+    if _accounts_dirty:
+        save_accounts(accounts)
+        _accounts_dirty = False
+
+
+def get_lockout_status(account: dict, now: Optional[float] = None):
+    """Return (is_locked: bool, minutes_remaining: int); now defaults to time.time()."""
+    # Common case: too few failures for a lockout, so no clock read is needed
+    if account.get("failed_attempts", 0) < MAX_FAILED_ATTEMPTS:
+        return False, 0
+
+    expiry = account.get("lockout_expiry") or 0
+    if now is None:
+        now = time.time()
+    if now < expiry:
+        return True, int((expiry - now) / 60)
     return False, 0
 
 
@@ -92,8 +313,8 @@ def create_account(accounts: dict) -> None:
         return
 
     role = input("  Role (student/admin) [default: student]: ").strip().lower()
-    if role not in ("student", "admin"):
-        role = "student"
+    if role not in (ROLE_STUDENT, ROLE_ADMIN):
+        role = ROLE_STUDENT
 
     password = input("  Set password: ").strip()
     if not password:
@@ -109,14 +330,15 @@ def create_account(accounts: dict) -> None:
         "role": role,
         "password_hash": hash_password(password),
         "failed_attempts": 0,
-        "lockout_time": None,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "lockout_expiry": 0,
+        "created_at": _now_str(),
         "last_login": None
     }
+    mark_accounts_dirty()
+    flush_accounts(accounts)
 
-    save_accounts(accounts)
     print(f"\n  Account '{username}' ({role}) created successfully.")
-    log_login_event(username, "ACCOUNT_CREATED", f"New {role} account registered")
+    log_login_event(username, STATUS_ACCOUNT_CREATED, f"New {role} account registered")
 
 
 def login(accounts: dict) -> None:
@@ -130,7 +352,7 @@ def login(accounts: dict) -> None:
 
     if username not in accounts:
         print("  Error: Account not found.")
-        log_login_event(username, "FAILED", "Account not found")
+        log_login_event(username, STATUS_FAILED, "Account not found")
         return
 
     account = accounts[username]
@@ -140,52 +362,80 @@ def login(accounts: dict) -> None:
     if locked:
         print(f"\n  Account is LOCKED due to too many failed attempts.")
         print(f"  Try again in {remaining} minute(s).")
-        log_login_event(username, "BLOCKED", f"Account locked, {remaining} min remaining")
+        log_login_event(username, STATUS_BLOCKED, f"Account locked, {remaining} min remaining")
+        return
+
+    # Refuse attempts inside the backoff window before any hashing or writes
+    wait = _attempt_backoff.get(username, 0) - time.time()
+    if wait > 0:
+        wait_seconds = math.ceil(wait)
+        print(f"\n  Too many recent failed attempts. Try again in {wait_seconds} second(s).")
+        log_login_event(username, STATUS_BLOCKED, f"Attempt during {wait_seconds}s backoff")
         return
 
     # Reset expired lockout
     if not locked and account.get("failed_attempts", 0) >= MAX_FAILED_ATTEMPTS:
         account["failed_attempts"] = 0
-        account["lockout_time"] = None
+        account["lockout_expiry"] = 0
+        mark_accounts_dirty()
 
     password = input("  Password: ").strip()
-    entered_hash = hash_password(password)
 
-    if entered_hash == account["password_hash"]:
+    if verify_password(password, account["password_hash"]):
+        # Upgrade legacy SHA-256 (or older scrypt) hashes now the password is known
+        if needs_rehash(account["password_hash"]):
+            account["password_hash"] = hash_password(password)
+        _attempt_backoff.pop(username, None)
         account["failed_attempts"] = 0
-        account["lockout_time"] = None
-        account["last_login"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        save_accounts(accounts)
+        account["lockout_expiry"] = 0
+        account["last_login"] = _now_str()
+        mark_accounts_dirty()
+        flush_accounts(accounts)
 
         print(f"\n  Login successful! Welcome, {username} ({account['role']}).")
         print(f"  Last login: {account.get('last_login', 'First login')}")
-        log_login_event(username, "SUCCESS", f"Successful login as {account['role']}")
+        log_login_event(
+            username, STATUS_SUCCESS, f"Successful login as {account['role']}", force_flush=True
+        )
     else:
         account["failed_attempts"] = account.get("failed_attempts", 0) + 1
+        _attempt_backoff[username] = time.time() + min(
+            BACKOFF_MAX_SECONDS, 2 ** account["failed_attempts"]
+        )
+        mark_accounts_dirty()
         attempts_left = MAX_FAILED_ATTEMPTS - account["failed_attempts"]
 
         if account["failed_attempts"] >= MAX_FAILED_ATTEMPTS:
-            account["lockout_time"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            save_accounts(accounts)
+            account["lockout_expiry"] = time.time() + LOCKOUT_DURATION_MINUTES * 60
+            flush_accounts(accounts)
             print(f"\n  Incorrect password. Account is now LOCKED for {LOCKOUT_DURATION_MINUTES} minutes.")
-            log_login_event(username, "LOCKED", f"Account locked after {MAX_FAILED_ATTEMPTS} failed attempts")
+            log_login_event(
+                username, STATUS_LOCKED, f"Account locked after {MAX_FAILED_ATTEMPTS} failed attempts",
+                force_flush=True
+            )
         else:
-            save_accounts(accounts)
+            flush_accounts(accounts)
             print(f"\n  Incorrect password. {attempts_left} attempt(s) remaining before lockout.")
-            log_login_event(username, "FAILED", f"Wrong password, {attempts_left} attempts left")
+            log_login_event(username, STATUS_FAILED, f"Wrong password, {attempts_left} attempts left")
 
 
 def view_login_history(log_file: str) -> None:
     """Display recent login attempts from the login log."""
     print("\n  --- Login Attempt History ---")
 
-    if not os.path.exists(LOGIN_LOG_FILE):
-        print("  No login history found.")
-        return
+    # Make sure events still in the write buffer are visible to the read below,
+    # without rotating the file out from under it
+    flush_login_log(rotate=False)
 
     try:
-        with open(LOGIN_LOG_FILE, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        # Show last 20 entries, topped up from the rotated log if the
+        # current one was only just started
+        lines = []
+        if os.path.exists(LOGIN_LOG_FILE):
+            lines = read_tail_lines(LOGIN_LOG_FILE, 20, 8192)
+        rotated_file = LOGIN_LOG_FILE + ".1"
+        if len(lines) < 20 and os.path.exists(rotated_file):
+            lines = read_tail_lines(rotated_file, 20 - len(lines), 8192) + lines
 
         if not lines:
             print("  No login history found.")
@@ -194,14 +444,19 @@ def view_login_history(log_file: str) -> None:
         print(f"\n  {'TIMESTAMP':<22} {'USER':<15} {'STATUS':<15} DETAILS")
         print("  " + "-" * 70)
 
-        for line in lines[-20:]:  # Show last 20 entries
-            parts = line.strip().split(" | ")
-            if len(parts) >= 3:
-                timestamp = parts[0] if len(parts) > 0 else "N/A"
-                user = parts[1].replace("USER=", "") if len(parts) > 1 else "N/A"
-                status = parts[2].replace("STATUS=", "") if len(parts) > 2 else "N/A"
+        for line in lines:
+            try:
+                timestamp, user, status, details = line.split("\t", 3)
+            except ValueError:
+                # Entry in the older "ts | USER=.. | STATUS=.. | details" format
+                parts = line.strip().split(" | ", 3)
+                if len(parts) < 3:
+                    continue
+                timestamp = parts[0]
+                user = parts[1].replace("USER=", "")
+                status = parts[2].replace("STATUS=", "")
                 details = parts[3] if len(parts) > 3 else ""
-                print(f"  {timestamp:<22} {user:<15} {status:<15} {details}")
+            print(f"  {timestamp:<22} {user:<15} {status:<15} {details}")
     except IOError:
         print("  Error reading login history.")
 
@@ -217,12 +472,13 @@ def view_all_accounts(accounts: dict) -> None:
     print(f"\n  {'USERNAME':<20} {'ROLE':<10} {'STATUS':<12} {'FAILED':<8} LAST LOGIN")
     print("  " + "-" * 75)
 
+    now = time.time()
     for username, info in accounts.items():
-        locked, _ = get_lockout_status(info)
+        locked, _ = get_lockout_status(info, now)
         status = "LOCKED" if locked else "ACTIVE"
         failed = info.get("failed_attempts", 0)
         last_login = info.get("last_login") or "Never"
-        role = info.get("role", "student")
+        role = info.get("role", ROLE_STUDENT)
         print(f"  {username:<20} {role:<10} {status:<12} {failed:<8} {last_login}")
 
 
@@ -236,10 +492,13 @@ def unlock_account(accounts: dict) -> None:
         return
 
     accounts[username]["failed_attempts"] = 0
-    accounts[username]["lockout_time"] = None
-    save_accounts(accounts)
+    accounts[username]["lockout_expiry"] = 0
+    _attempt_backoff.pop(username, None)
+    mark_accounts_dirty()
+    flush_accounts(accounts)
+
     print(f"  Account '{username}' has been unlocked successfully.")
-    log_login_event(username, "UNLOCKED", "Account manually unlocked by admin")
+    log_login_event(username, STATUS_UNLOCKED, "Account manually unlocked by admin")
 
 
 def view_submission_log(log_file: str) -> None:
@@ -251,8 +510,7 @@ def view_submission_log(log_file: str) -> None:
         return
 
     try:
-        with open(log_file, "r", encoding="utf-8") as f:
-            lines = f.readlines()
+        lines = read_tail_lines(log_file, 15, 4096)
 
         if not lines:
             print("  No activity recorded yet.")
@@ -260,7 +518,7 @@ def view_submission_log(log_file: str) -> None:
 
         print(f"\n  Showing last 15 entries from: {log_file}")
         print("  " + "-" * 80)
-        for line in lines[-15:]:
+        for line in lines:
             print(f"  {line.strip()}")
     except IOError:
         print("  Error reading submission log.")
@@ -285,19 +543,20 @@ def main_menu(log_file: str) -> None:
 
         choice = input("  Enter your choice [1-7]: ").strip()
 
-        if choice == "1":
+        # The in-memory accounts are authoritative unless the file was
+        # edited outside this process
+        if accounts_changed_on_disk():
             accounts = load_accounts()
+
+        if choice == "1":
             login(accounts)
         elif choice == "2":
-            accounts = load_accounts()
             create_account(accounts)
         elif choice == "3":
             view_login_history(log_file)
         elif choice == "4":
-            accounts = load_accounts()
             view_all_accounts(accounts)
         elif choice == "5":
-            accounts = load_accounts()
             unlock_account(accounts)
         elif choice == "6":
             view_submission_log(log_file)